@@ -8,30 +8,134 @@ Author: Generated with Claude Code
 License: MIT
 """
 
-from flask import Flask, render_template, request
+from flask import Flask, jsonify, render_template, request
+from jinja2 import FileSystemBytecodeCache
 import requests
+from requests.adapters import HTTPAdapter
+from concurrent.futures import ThreadPoolExecutor
+import gzip
+import os
 import re
+import tempfile
+import time
 
 app = Flask(__name__)
 
+# Persist compiled templates on disk so fresh worker processes skip the
+# Jinja parse/compile step, and stop re-checking template mtimes on every
+# render (templates only change with a deploy)
+_JINJA_CACHE_DIR = os.path.join(tempfile.gettempdir(), 'metar_jinja_cache')
+os.makedirs(_JINJA_CACHE_DIR, exist_ok=True)
+app.jinja_env.bytecode_cache = FileSystemBytecodeCache(directory=_JINJA_CACHE_DIR)
+app.jinja_env.auto_reload = False
+
+# Shared HTTP session: keeps TCP/TLS connections to the weather API alive
+# across requests instead of paying a DNS lookup and TLS handshake per call
+_SESSION = requests.Session()
+_SESSION.mount('https://', HTTPAdapter(pool_connections=16, pool_maxsize=32))
+
+# Upstream API timeout in seconds, overridable without a code change
+_REQUEST_TIMEOUT = float(os.getenv('METAR_TIMEOUT', '10'))
+
+# METAR observations only change about once an hour, so recently fetched
+# reports are served from memory instead of re-hitting the API. Maps
+# airport code -> (monotonic fetch time, raw METAR); oldest entry is
+# evicted once the cache is full (dicts preserve insertion order).
+_METAR_CACHE = {}
+_METAR_CACHE_TTL = 300   # seconds
+_METAR_CACHE_MAX = 256   # entries
+
+# Decoded results keyed by raw METAR string, so a cache hit also skips
+# the decode step; bounded the same way as _METAR_CACHE
+_DECODED_CACHE = {}
+
+# Worker pool for fetching stations individually in parallel when the
+# batched API request fails; sized to match the session's connection pool
+_FETCH_POOL = ThreadPoolExecutor(max_workers=8, thread_name_prefix='metar-fetch')
+
+# ICAO airport identifiers: a letter followed by three letters or digits
+# (compiled once at import, not per request)
+_ICAO_RE = re.compile(r'^[A-Z][A-Z0-9]{3}$')
+
+# Weather phenomena codes are always exactly 2 characters; insertion order
+# here is the order descriptions are reported in
+_PHENOMENA = {
+    'RA': 'rain',
+    'SN': 'snow',
+    'DZ': 'drizzle',
+    'FG': 'fog',
+    'BR': 'mist',
+    'HZ': 'haze',
+    'TS': 'thunderstorm',
+    'SH': 'showers'
+}
+
+# Intensity/proximity modifiers that may prefix a phenomena group
+_INTENSITY = {
+    '-': 'light ',
+    '+': 'heavy ',
+    'VC': 'nearby '
+}
+
+# 16-point compass rose, full names, indexed clockwise from north
+_WIND_NAMES = ('north', 'north-northeast', 'northeast', 'east-northeast',
+               'east', 'east-southeast', 'southeast', 'south-southeast',
+               'south', 'south-southwest', 'southwest', 'west-southwest',
+               'west', 'west-northwest', 'northwest', 'north-northwest')
+
+# Pre-formatted wind sentence prefixes, one per compass point, so the hot
+# path only appends the speed instead of building a fresh f-string
+_WIND_PREFIX = tuple(f"Wind from the {name} at " for name in _WIND_NAMES)
+
+def _wind_index(degrees):
+    """
+    Map a wind direction in degrees to an index into the 16-point rose.
+
+    Each direction covers 22.5 degrees (360/16); the modulo handles 0/360
+    wrap-around without a special case.
+    """
+    return int((degrees + 11.25) // 22.5) % 16
+
+# Standard cloud coverage codes, always exactly 3 characters
+_CLOUD_TYPES = {
+    'CLR': 'clear skies',           # Clear below 12,000 ft
+    'SKC': 'sky clear',             # Sky clear (automated stations)
+    'FEW': 'few clouds',            # 1-2 oktas (1/8-2/8 coverage)
+    'SCT': 'scattered clouds',      # 3-4 oktas (3/8-4/8 coverage)
+    'BKN': 'broken clouds',         # 5-7 oktas (5/8-7/8 coverage)
+    'OVC': 'overcast'               # 8 oktas (full coverage)
+}
+
+# Coverage codes that never carry an altitude suffix
+_CLOUD_NOALT = frozenset(('CLR', 'SKC'))
+
+def _parse_signed(value):
+    """
+    Parse one half of a METAR temperature token, where a leading 'M'
+    marks a below-zero value (e.g., 'M15' -> -15).
+    """
+    return -int(value[1:]) if value[0] == 'M' else int(value)
+
+def _is_temp_half(value):
+    """
+    Check whether a string is one half of a temp/dewpoint token: two
+    digits, optionally behind a leading 'M' (e.g., '22' or 'M15').
+    """
+    return ((len(value) == 2 and value.isdigit())
+            or (len(value) == 3 and value[0] == 'M' and value[1:].isdigit()))
+
 class METARDecoder:
     """
     A class to decode METAR weather reports into human-readable format.
     
     METAR is a standardized weather reporting format used in aviation.
-    This decoder converts cryptic codes into plain English descriptions.
+    The decoder is stateless; all lookup tables live at module scope so
+    they are built once at import rather than per instance. Empty
+    __slots__ keeps instances from carrying a needless __dict__.
     """
-    
-    def __init__(self):
-        """Initialize the decoder with wind direction mappings."""
-        # Map compass direction abbreviations to full names
-        self.wind_directions = {
-            'N': 'north', 'NNE': 'north-northeast', 'NE': 'northeast', 'ENE': 'east-northeast',
-            'E': 'east', 'ESE': 'east-southeast', 'SE': 'southeast', 'SSE': 'south-southeast',
-            'S': 'south', 'SSW': 'south-southwest', 'SW': 'southwest', 'WSW': 'west-southwest',
-            'W': 'west', 'WNW': 'west-northwest', 'NW': 'northwest', 'NNW': 'north-northwest'
-        }
-    
+
+    __slots__ = ()
+
     def get_wind_direction_text(self, degrees):
         """
         Convert wind direction in degrees to human-readable compass direction.
@@ -42,16 +146,7 @@ class METARDecoder:
         Returns:
             str: Human-readable wind direction (e.g., 'north', 'southwest')
         """
-        if degrees == 0 or degrees == 360:
-            return 'north'
-        
-        # 16-point compass rose directions
-        directions = ['N', 'NNE', 'NE', 'ENE', 'E', 'ESE', 'SE', 'SSE', 
-                     'S', 'SSW', 'SW', 'WSW', 'W', 'WNW', 'NW', 'NNW']
-        
-        # Each direction covers 22.5 degrees (360/16)
-        index = round(degrees / 22.5) % 16
-        return self.wind_directions[directions[index]]
+        return _WIND_NAMES[_wind_index(degrees)]
     
     def decode_visibility(self, vis_str):
         """
@@ -63,9 +158,9 @@ class METARDecoder:
         Returns:
             str: Human-readable visibility description
         """
-        if vis_str == '10SM' or vis_str.endswith('SM'):
-            miles = vis_str.replace('SM', '')  # Remove 'SM' (statute miles) suffix
-            if miles == '10' or int(miles) >= 10:
+        if vis_str.endswith('SM'):
+            miles = int(vis_str[:-2])  # Strip 'SM' (statute miles) suffix
+            if miles >= 10:
                 return "10+ miles visibility"
             return f"{miles} miles visibility"
         return "visibility not reported"
@@ -80,30 +175,22 @@ class METARDecoder:
         Returns:
             str: Human-readable cloud description with altitude if applicable
         """
-        # Standard cloud coverage codes
-        cloud_types = {
-            'CLR': 'clear skies',           # Clear below 12,000 ft
-            'SKC': 'sky clear',             # Sky clear (automated stations)
-            'FEW': 'few clouds',            # 1-2 oktas (1/8-2/8 coverage)
-            'SCT': 'scattered clouds',      # 3-4 oktas (3/8-4/8 coverage)
-            'BKN': 'broken clouds',         # 5-7 oktas (5/8-7/8 coverage)
-            'OVC': 'overcast'              # 8 oktas (full coverage)
-        }
-        
-        for code, description in cloud_types.items():
-            if cloud_str.startswith(code):
-                # Clear/sky clear conditions don't have altitude
-                if code in ['CLR', 'SKC']:
-                    return description
-                
-                # Extract altitude (3 digits representing hundreds of feet)
-                altitude_match = re.search(r'(\d{3})', cloud_str)
-                if altitude_match:
-                    altitude = int(altitude_match.group(1)) * 100  # Convert to actual feet
-                    return f"{description} at {altitude} feet"
-                return description
-                
-        return "cloud conditions not reported"
+        # Coverage codes are always 3 characters, so one dict lookup on the
+        # prefix replaces probing every code in turn
+        code = cloud_str[:3]
+        description = _CLOUD_TYPES.get(code)
+        if description is None:
+            return "cloud conditions not reported"
+
+        # Clear/sky clear conditions don't have altitude
+        if code in _CLOUD_NOALT:
+            return description
+
+        # Extract altitude (3 digits representing hundreds of feet)
+        altitude = cloud_str[3:6]
+        if len(altitude) == 3 and altitude.isdigit():
+            return f"{description} at {int(altitude) * 100} feet"
+        return description
     
     def decode_weather_phenomena(self, wx_str):
         """
@@ -115,32 +202,22 @@ class METARDecoder:
         Returns:
             str or None: Human-readable weather description, None if no phenomena found
         """
-        # Common weather phenomena codes
-        phenomena = {
-            'RA': 'rain',
-            'SN': 'snow', 
-            'DZ': 'drizzle',
-            'FG': 'fog',
-            'BR': 'mist',
-            'HZ': 'haze',
-            'TS': 'thunderstorm',
-            'SH': 'showers'
-        }
-        
-        result = []
-        for code, desc in phenomena.items():
-            if code in wx_str:
-                intensity_prefix = ''
-                # Check for intensity modifiers
-                if wx_str.startswith('-'):
-                    intensity_prefix = 'light '
-                elif wx_str.startswith('+'):
-                    intensity_prefix = 'heavy '
-                elif wx_str.startswith('VC'):
-                    intensity_prefix = 'nearby '
-                    
-                result.append(f"{intensity_prefix}{desc}")
-        
+        # Strip the intensity/proximity modifier, if any
+        intensity_prefix = ''
+        if wx_str[:2] == 'VC':
+            intensity_prefix = _INTENSITY['VC']
+            wx_str = wx_str[2:]
+        elif wx_str[:1] in _INTENSITY:
+            intensity_prefix = _INTENSITY[wx_str[:1]]
+            wx_str = wx_str[1:]
+
+        # The remainder is a run of 2-letter codes; collect them with set
+        # lookups, then report in the standard _PHENOMENA order
+        found = {wx_str[i:i + 2] for i in range(0, len(wx_str) - 1, 2)}
+
+        result = [f"{intensity_prefix}{desc}"
+                  for code, desc in _PHENOMENA.items() if code in found]
+
         return ', '.join(result) if result else None
     
     def celsius_to_fahrenheit(self, celsius):
@@ -153,7 +230,10 @@ class METARDecoder:
         Returns:
             int: Temperature in Fahrenheit, rounded to nearest degree
         """
-        return round((celsius * 9/5) + 32)
+        # Integer-only nearest-degree rounding: 9c/5 never lands exactly on
+        # .5 for integer c, so adding 2 before the floor division matches
+        # round((c * 9/5) + 32) without any float arithmetic
+        return (celsius * 9 + 2) // 5 + 32
     
     def decode_metar(self, metar_string):
         """
@@ -165,8 +245,6 @@ class METARDecoder:
         Returns:
             dict: Dictionary containing summary, detailed breakdown, and raw METAR
         """
-        parts = metar_string.split()
-        
         # Initialize decoded weather information structure
         decoded = {
             'station': '',       # Airport identifier
@@ -180,65 +258,84 @@ class METARDecoder:
             'pressure': ''      # Barometric pressure
         }
         
-        if not parts:
+        if not metar_string or metar_string.isspace():
             return "Unable to decode METAR"
-        
-        # First element is always the station identifier (e.g., KHIO)
-        decoded['station'] = parts[0]
-        
-        # Parse each component of the METAR string
-        for part in parts:
+
+        # Parse each component of the METAR string in a single left-to-right
+        # scan, finding token boundaries with str.find instead of
+        # materializing a list via split(). Tokens are uniquely identifiable
+        # by their first characters and shape, so dispatch on cheap
+        # character/length checks instead of running the regex engine
+        # against every token.
+        pos = 0
+        length = len(metar_string)
+        while pos < length:
+            end = metar_string.find(' ', pos)
+            if end < 0:
+                end = length
+            if end == pos:  # skip runs of separating whitespace
+                pos += 1
+                continue
+            part = metar_string[pos:end]
+            pos = end + 1
+
+            # First token is always the station identifier (e.g., KHIO)
+            if not decoded['station']:
+                decoded['station'] = part
+
             # Time stamp: DDHHMMZ format (day, hour, minute, Zulu time)
-            if re.match(r'\d{6}Z', part):
+            if len(part) == 7 and part[6] == 'Z' and part[:6].isdigit():
                 day = part[:2]
-                hour = part[2:4] 
+                hour = part[2:4]
                 minute = part[4:6]
                 decoded['time'] = f"Observed at {hour}:{minute}Z on day {day}"
-            
+
             # Wind information: DDDSSKT (direction in degrees, speed in knots)
-            elif re.match(r'\d{3}\d{2}KT', part) or re.match(r'VRB\d{2}KT', part):
-                if part.startswith('VRB'):  # Variable wind direction
-                    speed = part[3:5]
-                    decoded['wind'] = f"Variable wind at {speed} knots"
-                else:
-                    direction = int(part[:3])  # Wind direction in degrees
-                    speed = int(part[3:5])     # Wind speed in knots
-                    wind_dir_text = self.get_wind_direction_text(direction)
-                    decoded['wind'] = f"Wind from the {wind_dir_text} at {speed} knots"
-            
+            elif part.endswith('KT') and part[:5].isdigit():
+                direction = int(part[:3])  # Wind direction in degrees
+                speed = int(part[3:5])     # Wind speed in knots
+                decoded['wind'] = _WIND_PREFIX[_wind_index(direction)] + str(speed) + " knots"
+
+            # Variable wind direction: VRBSSKT
+            elif part.startswith('VRB') and part.endswith('KT') and part[3:5].isdigit():
+                speed = part[3:5]
+                decoded['wind'] = f"Variable wind at {speed} knots"
+
             # Visibility in statute miles
             elif part.endswith('SM'):
                 decoded['visibility'] = self.decode_visibility(part)
-            
-            # Weather phenomena (rain, snow, fog, etc.)
-            elif any(wx in part for wx in ['RA', 'SN', 'DZ', 'FG', 'BR', 'HZ', 'TS', 'SH']):
+
+            # Weather phenomena (rain, snow, fog, etc.), possibly behind a
+            # -/+/VC modifier
+            elif part[:2] in _PHENOMENA or part[1:3] in _PHENOMENA or part[:2] == 'VC':
                 weather = self.decode_weather_phenomena(part)
                 if weather:
                     decoded['weather'] = weather
-            
+
             # Cloud coverage and altitude
-            elif any(part.startswith(cloud) for cloud in ['CLR', 'SKC', 'FEW', 'SCT', 'BKN', 'OVC']):
+            elif part[:3] in _CLOUD_TYPES:
                 decoded['clouds'] = self.decode_clouds(part)
-            
+
             # Temperature and dewpoint: TT/DD format (M prefix indicates negative)
-            elif re.match(r'M?\d{2}/M?\d{2}', part):
-                temps = part.split('/')
-                # Convert 'M' prefix to negative sign for below-zero temperatures
-                temp_c = int(temps[0].replace('M', '-'))
-                dew_c = int(temps[1].replace('M', '-'))
-                
-                # Convert to Fahrenheit for US users
-                temp_f = self.celsius_to_fahrenheit(temp_c)
-                dew_f = self.celsius_to_fahrenheit(dew_c)
-                
-                decoded['temperature'] = f"{temp_f}°F ({temp_c}°C)"
-                decoded['dewpoint'] = f"Dewpoint {dew_f}°F ({dew_c}°C)"
+            elif '/' in part:
+                slash = part.find('/')
+                if _is_temp_half(part[:slash]) and _is_temp_half(part[slash + 1:]):
+                    temp_c = _parse_signed(part[:slash])
+                    dew_c = _parse_signed(part[slash + 1:])
+
+                    # Convert to Fahrenheit for US users
+                    temp_f = self.celsius_to_fahrenheit(temp_c)
+                    dew_f = self.celsius_to_fahrenheit(dew_c)
+
+                    decoded['temperature'] = f"{temp_f}°F ({temp_c}°C)"
+                    decoded['dewpoint'] = f"Dewpoint {dew_f}°F ({dew_c}°C)"
             
             # Altimeter setting: ATTTT format (inches of mercury * 100)
-            elif part.startswith('A') and len(part) == 5:
-                # Convert from hundredths to actual inHg (e.g., A3012 -> 30.12)
-                pressure_inhg = float(part[1:3] + '.' + part[3:5])
-                decoded['pressure'] = f"Pressure {pressure_inhg} inHg"
+            elif part[0] == 'A' and len(part) == 5 and part[1:].isdigit():
+                # Value is hundredths of inHg (e.g., A3012 -> 30.12); split it
+                # with integer division rather than a string concat + float trip
+                pressure = int(part[1:5])
+                decoded['pressure'] = f"Pressure {pressure // 100}.{pressure % 100:02d} inHg"
         
         # Build a concise weather summary for display
         summary_parts = []
@@ -265,35 +362,162 @@ class METARDecoder:
             'raw_metar': metar_string  # Original METAR for reference
         }
 
-def fetch_metar(airport_code):
+# Shared decoder instance - the decoder is stateless, so one per process
+# is enough and each request avoids rebuilding it
+_DECODER = METARDecoder()
+
+def _cache_metar(airport_code, metar_data, now):
+    """Store a fetched METAR, evicting the oldest entry when full."""
+    _METAR_CACHE[airport_code] = (now, metar_data)
+    if len(_METAR_CACHE) > _METAR_CACHE_MAX:
+        del _METAR_CACHE[next(iter(_METAR_CACHE))]
+
+def _fetch_one(airport_code):
     """
-    Fetch METAR data from the Aviation Weather Center API.
-    
+    Fetch a single station's raw METAR directly from the API.
+
     Args:
-        airport_code (str): 4-letter ICAO airport identifier (e.g., 'KHIO')
-        
+        airport_code (str): 4-letter ICAO airport identifier, uppercased
+
     Returns:
-        str or None: Raw METAR string if successful, None if failed or no data
+        str or None: Raw METAR string, or None on failure or no data
     """
-    # Aviation Weather Center METAR API endpoint
-    url = f"https://aviationweather.gov/api/data/metar?ids={airport_code.upper()}"
-    
+    url = f"https://aviationweather.gov/api/data/metar?ids={airport_code}"
+
+    try:
+        response = _SESSION.get(url, timeout=_REQUEST_TIMEOUT)
+        response.raise_for_status()
+    except requests.RequestException:
+        return None
+
+    metar_data = response.text.strip()
+    if not metar_data or metar_data.lower().startswith('no metar'):
+        return None
+    return metar_data
+
+def fetch_metars(airport_codes):
+    """
+    Fetch METAR data for several airports with one Aviation Weather Center
+    API call.
+
+    The API accepts comma-separated identifiers, so a single round-trip
+    covers every station that isn't already cached.
+
+    Args:
+        airport_codes (list): ICAO airport identifiers (e.g., ['KHIO', 'KPDX'])
+
+    Returns:
+        dict: Mapping of airport code to raw METAR string; codes with no
+            data are omitted
+    """
+    now = time.monotonic()
+    results = {}
+    missing = []
+
+    # Serve stations from cache while their observations are still fresh
+    for code in airport_codes:
+        code = code.upper()
+        cached = _METAR_CACHE.get(code)
+        if cached is not None and now - cached[0] < _METAR_CACHE_TTL:
+            results[code] = cached[1]
+        elif code not in missing:
+            missing.append(code)
+
+    if not missing:
+        return results
+
+    # Aviation Weather Center METAR API endpoint, one request for all
+    # uncached stations
+    url = f"https://aviationweather.gov/api/data/metar?ids={','.join(missing)}"
+
     try:
         # Make HTTP request with reasonable timeout
-        response = requests.get(url, timeout=10)
+        response = _SESSION.get(url, timeout=_REQUEST_TIMEOUT)
         response.raise_for_status()  # Raise exception for HTTP errors
-        
-        metar_data = response.text.strip()
-        
-        # Check if we received valid METAR data
-        if not metar_data or metar_data.lower().startswith('no metar'):
-            return None
-            
-        return metar_data
-        
     except requests.RequestException:
-        # Handle network errors, timeouts, HTTP errors, etc.
-        return None
+        # Batched request failed; retry the stations individually with
+        # overlapped I/O so the batch takes as long as the slowest
+        # response rather than the sum of them
+        for code, metar_data in zip(missing, _FETCH_POOL.map(_fetch_one, missing)):
+            if metar_data:
+                results[code] = metar_data
+                _cache_metar(code, metar_data, now)
+        return results
+
+    # The response carries one METAR per line, each starting with its
+    # station identifier
+    for line in response.text.splitlines():
+        line = line.strip()
+        if not line or line.lower().startswith('no metar'):
+            continue
+
+        station = line.split(' ', 1)[0]
+        results[station] = line
+        _cache_metar(station, line, now)
+
+    return results
+
+def fetch_metar(airport_code):
+    """
+    Fetch METAR data from the Aviation Weather Center API.
+
+    Args:
+        airport_code (str): 4-letter ICAO airport identifier (e.g., 'KHIO')
+
+    Returns:
+        str or None: Raw METAR string if successful, None if failed or no data
+    """
+    return fetch_metars([airport_code]).get(airport_code.upper())
+
+def _decode_cached(metar_raw):
+    """
+    Decode a raw METAR, reusing a previous decode of the identical report
+    when available.
+
+    Args:
+        metar_raw (str): Raw METAR string
+
+    Returns:
+        dict: Decoded METAR (see METARDecoder.decode_metar)
+    """
+    decoded_metar = _DECODED_CACHE.get(metar_raw)
+    if decoded_metar is None:
+        decoded_metar = _DECODER.decode_metar(metar_raw)
+        _DECODED_CACHE[metar_raw] = decoded_metar
+        if len(_DECODED_CACHE) > _METAR_CACHE_MAX:
+            del _DECODED_CACHE[next(iter(_DECODED_CACHE))]
+    return decoded_metar
+
+# Response bodies below this size aren't worth the compression overhead
+_COMPRESS_MIN_SIZE = 500
+_COMPRESS_MIMETYPES = frozenset(('text/html', 'text/css', 'application/json'))
+
+@app.after_request
+def compress_response(response):
+    """
+    Gzip eligible responses when the client advertises support.
+
+    The result pages are dominated by repeated markup and compress by
+    roughly 70-80%, so for slow links this saves more wall-clock time
+    than any server-side work.
+
+    Args:
+        response (Response): Outgoing Flask response
+
+    Returns:
+        Response: The response, gzip-encoded when worthwhile
+    """
+    if (response.status_code == 200
+            and not response.direct_passthrough
+            and response.mimetype in _COMPRESS_MIMETYPES
+            and response.content_length is not None
+            and response.content_length >= _COMPRESS_MIN_SIZE
+            and 'Content-Encoding' not in response.headers
+            and 'gzip' in request.headers.get('Accept-Encoding', '').lower()):
+        response.set_data(gzip.compress(response.get_data(), compresslevel=6))
+        response.headers['Content-Encoding'] = 'gzip'
+        response.headers['Vary'] = 'Accept-Encoding'
+    return response
 
 # Flask route handlers
 
@@ -325,7 +549,11 @@ def get_metar():
     # ICAO airport codes are always 4 characters
     if len(airport_code) != 4:
         return render_template('index.html', error="Airport code must be 4 characters (e.g., KHIO)")
-    
+
+    # Reject malformed codes before spending a network round-trip on them
+    if not _ICAO_RE.match(airport_code):
+        return render_template('index.html', error="Airport code must be a valid ICAO identifier (e.g., KHIO)")
+
     # Fetch raw METAR data from API
     metar_raw = fetch_metar(airport_code)
     
@@ -334,16 +562,83 @@ def get_metar():
                              error=f"Could not fetch METAR for {airport_code}. Please check the airport code.")
     
     # Decode METAR into human-readable format
-    decoder = METARDecoder()
-    decoded_metar = decoder.decode_metar(metar_raw)
+    decoded_metar = _decode_cached(metar_raw)
     
     # Display results
     return render_template('result.html', 
                          airport_code=airport_code,
                          decoded=decoded_metar)
 
+@app.route('/metar/batch', methods=['POST'])
+def get_metar_batch():
+    """
+    Process a batch METAR request - fetch and decode weather for several
+    airports with a single upstream API call.
+
+    Returns:
+        str: Rendered HTML template with one report per airport, or the
+            input form with an error message
+    """
+    # Codes may be separated by commas and/or whitespace
+    raw_codes = request.form.get('airport_codes', '')
+    airport_codes = [code.upper() for code in raw_codes.replace(',', ' ').split()]
+
+    # Validate input
+    if not airport_codes:
+        return render_template('index.html', error="Please enter at least one airport code")
+
+    for airport_code in airport_codes:
+        if len(airport_code) != 4 or not _ICAO_RE.match(airport_code):
+            return render_template('index.html',
+                                   error=f"Invalid airport code: {airport_code}. Codes must be 4 characters (e.g., KHIO)")
+
+    # One upstream API call covers every requested station
+    metars = fetch_metars(airport_codes)
+
+    # Decode whatever came back; stations with no data get a None report
+    reports = [{'airport_code': code,
+                'decoded': _decode_cached(metars[code]) if code in metars else None}
+               for code in airport_codes]
+
+    return render_template('batch_result.html', reports=reports)
+
+@app.route('/api/metar')
+def api_metar():
+    """
+    JSON API - fetch and decode METARs without an HTML render.
+
+    Lets clients request weather asynchronously (e.g., via fetch() from
+    the form page) instead of blocking on a server-side template render.
+
+    Query string:
+        ids: One or more ICAO airport identifiers, comma or space separated
+
+    Returns:
+        Response: JSON mapping each airport code to its decoded report
+            (null for stations with no data), or an error object
+    """
+    raw_codes = request.args.get('ids', '')
+    airport_codes = [code.upper() for code in raw_codes.replace(',', ' ').split()]
+
+    # Validate input
+    if not airport_codes:
+        return jsonify({'error': 'Provide one or more airport codes via ?ids='}), 400
+
+    for airport_code in airport_codes:
+        if len(airport_code) != 4 or not _ICAO_RE.match(airport_code):
+            return jsonify({'error': f'Invalid airport code: {airport_code}'}), 400
+
+    metars = fetch_metars(airport_codes)
+    reports = {code: _decode_cached(metars[code]) if code in metars else None
+               for code in airport_codes}
+
+    return jsonify(reports)
+
 # Application entry point
 if __name__ == '__main__':
-    # Run the Flask development server
-    # Note: For production deployment, use a proper WSGI server like Gunicorn
-    app.run(debug=True, host='127.0.0.1', port=5000)
\ No newline at end of file
+    # Run the Flask development server; the reloader/debugger only runs when
+    # FLASK_DEBUG is set so a plain `python app.py` doesn't pay for them.
+    # For production deployment, use a proper WSGI server via wsgi.py:
+    #   gunicorn -w 4 -k gthread --threads 8 -b 0.0.0.0:5000 wsgi:application
+    debug = os.getenv('FLASK_DEBUG', '').lower() in ('1', 'true', 'yes')
+    app.run(debug=debug, host='127.0.0.1', port=5000)
\ No newline at end of file
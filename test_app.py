@@ -1,75 +1,74 @@
 import pytest
 import unittest.mock as mock
 from unittest.mock import patch
-from app import METARDecoder, fetch_metar, app
+from app import METARDecoder, fetch_metar, fetch_metars, app
+
+
+@pytest.fixture(scope="module")
+def decoder():
+    """Shared METARDecoder instance - the decoder is stateless, so one
+    instance serves every test in the module."""
+    return METARDecoder()
 
 
 class TestMETARDecoder:
     """Test suite for the METARDecoder class."""
     
-    def setup_method(self):
-        """Set up test fixtures before each test method."""
-        self.decoder = METARDecoder()
-    
-    def test_get_wind_direction_text(self):
+    def test_get_wind_direction_text(self, decoder):
         """Test wind direction conversion from degrees to text."""
-        assert self.decoder.get_wind_direction_text(0) == 'north'
-        assert self.decoder.get_wind_direction_text(360) == 'north'
-        assert self.decoder.get_wind_direction_text(90) == 'east'
-        assert self.decoder.get_wind_direction_text(180) == 'south'
-        assert self.decoder.get_wind_direction_text(270) == 'west'
-        assert self.decoder.get_wind_direction_text(45) == 'northeast'
-        assert self.decoder.get_wind_direction_text(225) == 'southwest'
+        assert decoder.get_wind_direction_text(0) == 'north'
+        assert decoder.get_wind_direction_text(360) == 'north'
+        assert decoder.get_wind_direction_text(90) == 'east'
+        assert decoder.get_wind_direction_text(180) == 'south'
+        assert decoder.get_wind_direction_text(270) == 'west'
+        assert decoder.get_wind_direction_text(45) == 'northeast'
+        assert decoder.get_wind_direction_text(225) == 'southwest'
     
-    def test_decode_visibility(self):
+    def test_decode_visibility(self, decoder):
         """Test visibility decoding from METAR format."""
-        assert self.decoder.decode_visibility('10SM') == '10+ miles visibility'
-        assert self.decoder.decode_visibility('5SM') == '5 miles visibility'
-        assert self.decoder.decode_visibility('1SM') == '1 miles visibility'
-        assert self.decoder.decode_visibility('15SM') == '10+ miles visibility'
-        assert self.decoder.decode_visibility('CAVOK') == 'visibility not reported'
+        assert decoder.decode_visibility('10SM') == '10+ miles visibility'
+        assert decoder.decode_visibility('5SM') == '5 miles visibility'
+        assert decoder.decode_visibility('1SM') == '1 miles visibility'
+        assert decoder.decode_visibility('15SM') == '10+ miles visibility'
+        assert decoder.decode_visibility('CAVOK') == 'visibility not reported'
     
-    def test_decode_clouds(self):
+    def test_decode_clouds(self, decoder):
         """Test cloud coverage and altitude decoding."""
-        assert self.decoder.decode_clouds('CLR') == 'clear skies'
-        assert self.decoder.decode_clouds('SKC') == 'sky clear'
-        assert self.decoder.decode_clouds('FEW015') == 'few clouds at 1500 feet'
-        assert self.decoder.decode_clouds('SCT025') == 'scattered clouds at 2500 feet'
-        assert self.decoder.decode_clouds('BKN040') == 'broken clouds at 4000 feet'
-        assert self.decoder.decode_clouds('OVC008') == 'overcast at 800 feet'
-        assert self.decoder.decode_clouds('UNKNOWN') == 'cloud conditions not reported'
+        assert decoder.decode_clouds('CLR') == 'clear skies'
+        assert decoder.decode_clouds('SKC') == 'sky clear'
+        assert decoder.decode_clouds('FEW015') == 'few clouds at 1500 feet'
+        assert decoder.decode_clouds('SCT025') == 'scattered clouds at 2500 feet'
+        assert decoder.decode_clouds('BKN040') == 'broken clouds at 4000 feet'
+        assert decoder.decode_clouds('OVC008') == 'overcast at 800 feet'
+        assert decoder.decode_clouds('UNKNOWN') == 'cloud conditions not reported'
     
-    def test_decode_weather_phenomena(self):
+    def test_decode_weather_phenomena(self, decoder):
         """Test weather phenomena decoding."""
-        assert self.decoder.decode_weather_phenomena('RA') == 'rain'
-        assert self.decoder.decode_weather_phenomena('-RA') == 'light rain'
-        assert self.decoder.decode_weather_phenomena('+RA') == 'heavy rain'
-        assert self.decoder.decode_weather_phenomena('VCFG') == 'nearby fog'
-        assert self.decoder.decode_weather_phenomena('TSRA') == 'rain, thunderstorm'
-        assert self.decoder.decode_weather_phenomena('SN') == 'snow'
-        assert self.decoder.decode_weather_phenomena('-SN') == 'light snow'
-        assert self.decoder.decode_weather_phenomena('NOSUCH') is None
+        assert decoder.decode_weather_phenomena('RA') == 'rain'
+        assert decoder.decode_weather_phenomena('-RA') == 'light rain'
+        assert decoder.decode_weather_phenomena('+RA') == 'heavy rain'
+        assert decoder.decode_weather_phenomena('VCFG') == 'nearby fog'
+        assert decoder.decode_weather_phenomena('TSRA') == 'rain, thunderstorm'
+        assert decoder.decode_weather_phenomena('SN') == 'snow'
+        assert decoder.decode_weather_phenomena('-SN') == 'light snow'
+        assert decoder.decode_weather_phenomena('NOSUCH') is None
     
-    def test_celsius_to_fahrenheit(self):
+    def test_celsius_to_fahrenheit(self, decoder):
         """Test temperature conversion."""
-        assert self.decoder.celsius_to_fahrenheit(0) == 32
-        assert self.decoder.celsius_to_fahrenheit(100) == 212
-        assert self.decoder.celsius_to_fahrenheit(-40) == -40
-        assert self.decoder.celsius_to_fahrenheit(20) == 68
-        assert self.decoder.celsius_to_fahrenheit(-10) == 14
+        assert decoder.celsius_to_fahrenheit(0) == 32
+        assert decoder.celsius_to_fahrenheit(100) == 212
+        assert decoder.celsius_to_fahrenheit(-40) == -40
+        assert decoder.celsius_to_fahrenheit(20) == 68
+        assert decoder.celsius_to_fahrenheit(-10) == 14
 
 
 class TestMETARDecodingIntegration:
     """Integration tests for complete METAR decoding."""
     
-    def setup_method(self):
-        """Set up test fixtures before each test method."""
-        self.decoder = METARDecoder()
-    
-    def test_decode_complete_metar_clear_weather(self):
+    def test_decode_complete_metar_clear_weather(self, decoder):
         """Test decoding a complete METAR with clear weather."""
         metar = "KHIO 061853Z 27008KT 10SM CLR 22/16 A3012"
-        result = self.decoder.decode_metar(metar)
+        result = decoder.decode_metar(metar)
         
         assert result['details']['station'] == 'KHIO'
         assert 'Observed at 18:53Z on day 06' in result['details']['time']
@@ -80,10 +79,10 @@ class TestMETARDecodingIntegration:
         assert 'Dewpoint 61°F (16°C)' in result['details']['dewpoint']
         assert 'Pressure 30.12 inHg' in result['details']['pressure']
     
-    def test_decode_metar_with_weather(self):
+    def test_decode_metar_with_weather(self, decoder):
         """Test decoding METAR with active weather phenomena."""
         metar = "KORD 061851Z 09014KT 3SM -RA SCT008 BKN015 OVC025 18/17 A2992"
-        result = self.decoder.decode_metar(metar)
+        result = decoder.decode_metar(metar)
         
         assert result['details']['station'] == 'KORD'
         assert 'Wind from the east at 14 knots' in result['details']['wind']
@@ -92,44 +91,49 @@ class TestMETARDecodingIntegration:
         assert 'overcast at 2500 feet' in result['details']['clouds']
         assert '64°F (18°C)' in result['details']['temperature']
     
-    def test_decode_metar_variable_wind(self):
+    def test_decode_metar_variable_wind(self, decoder):
         """Test decoding METAR with variable wind direction."""
         metar = "KJFK 061851Z VRB05KT 10SM FEW250 25/20 A3008"
-        result = self.decoder.decode_metar(metar)
+        result = decoder.decode_metar(metar)
         
         assert result['details']['wind'] == 'Variable wind at 05 knots'
         assert result['details']['visibility'] == '10+ miles visibility'
         assert 'few clouds at 25000 feet' in result['details']['clouds']
     
-    def test_decode_metar_negative_temperatures(self):
+    def test_decode_metar_negative_temperatures(self, decoder):
         """Test decoding METAR with below-zero temperatures."""
         metar = "PANC 061853Z 36010KT 10SM CLR M15/M20 A2985"
-        result = self.decoder.decode_metar(metar)
+        result = decoder.decode_metar(metar)
         
         assert '5°F (-15°C)' in result['details']['temperature']
         assert 'Dewpoint -4°F (-20°C)' in result['details']['dewpoint']
     
-    def test_decode_metar_multiple_weather_phenomena(self):
+    def test_decode_metar_multiple_weather_phenomena(self, decoder):
         """Test decoding METAR with multiple weather conditions."""
         metar = "KBOS 061854Z 08015KT 2SM +TSRA BKN008 OVC020 20/19 A2995"
-        result = self.decoder.decode_metar(metar)
+        result = decoder.decode_metar(metar)
         
         assert 'heavy rain, heavy thunderstorm' in result['details']['weather']
         assert result['details']['visibility'] == '2 miles visibility'
     
-    def test_decode_empty_metar(self):
+    def test_decode_empty_metar(self, decoder):
         """Test handling of empty or invalid METAR string."""
-        result = self.decoder.decode_metar("")
+        result = decoder.decode_metar("")
         assert result == "Unable to decode METAR"
         
-        result = self.decoder.decode_metar("   ")
+        result = decoder.decode_metar("   ")
         assert result == "Unable to decode METAR"
 
 
 class TestFetchMETAR:
     """Test suite for METAR fetching functionality."""
-    
-    @patch('app.requests.get')
+
+    def setup_method(self):
+        """Clear the METAR cache so each test hits the (mocked) network."""
+        import app as app_module
+        app_module._METAR_CACHE.clear()
+
+    @patch('app._SESSION.get')
     def test_fetch_metar_success(self, mock_get):
         """Test successful METAR data fetching."""
         mock_response = mock.Mock()
@@ -145,7 +149,7 @@ class TestFetchMETAR:
             timeout=10
         )
     
-    @patch('app.requests.get')
+    @patch('app._SESSION.get')
     def test_fetch_metar_no_data(self, mock_get):
         """Test handling when no METAR data is available."""
         mock_response = mock.Mock()
@@ -157,7 +161,7 @@ class TestFetchMETAR:
         
         assert result is None
     
-    @patch('app.requests.get')
+    @patch('app._SESSION.get')
     def test_fetch_metar_network_error(self, mock_get):
         """Test handling of network errors."""
         from requests.exceptions import RequestException
@@ -167,7 +171,7 @@ class TestFetchMETAR:
         
         assert result is None
     
-    @patch('app.requests.get')
+    @patch('app._SESSION.get')
     def test_fetch_metar_http_error(self, mock_get):
         """Test handling of HTTP errors."""
         mock_response = mock.Mock()
@@ -179,7 +183,7 @@ class TestFetchMETAR:
         
         assert result is None
     
-    @patch('app.requests.get')
+    @patch('app._SESSION.get')
     def test_fetch_metar_empty_response(self, mock_get):
         """Test handling of empty API response."""
         mock_response = mock.Mock()
@@ -192,6 +196,56 @@ class TestFetchMETAR:
         assert result is None
 
 
+class TestFetchMETARs:
+    """Test suite for batched METAR fetching."""
+
+    def setup_method(self):
+        """Clear the METAR cache so each test hits the (mocked) network."""
+        import app as app_module
+        app_module._METAR_CACHE.clear()
+
+    @patch('app._SESSION.get')
+    def test_fetch_metars_single_request(self, mock_get):
+        """Test that multiple airports are fetched with one API call."""
+        mock_response = mock.Mock()
+        mock_response.text = ("KHIO 061853Z 27008KT 10SM CLR 22/16 A3012\n"
+                              "KPDX 061853Z 27010KT 10SM CLR 21/15 A3010")
+        mock_response.raise_for_status.return_value = None
+        mock_get.return_value = mock_response
+
+        result = fetch_metars(['KHIO', 'KPDX'])
+
+        assert result['KHIO'].startswith('KHIO')
+        assert result['KPDX'].startswith('KPDX')
+        mock_get.assert_called_once_with(
+            "https://aviationweather.gov/api/data/metar?ids=KHIO,KPDX",
+            timeout=10
+        )
+
+    @patch('app._SESSION.get')
+    def test_fetch_metars_omits_missing_stations(self, mock_get):
+        """Test that stations with no data are left out of the result."""
+        mock_response = mock.Mock()
+        mock_response.text = "KHIO 061853Z 27008KT 10SM CLR 22/16 A3012"
+        mock_response.raise_for_status.return_value = None
+        mock_get.return_value = mock_response
+
+        result = fetch_metars(['KHIO', 'ZZZZ'])
+
+        assert 'KHIO' in result
+        assert 'ZZZZ' not in result
+
+    @patch('app._SESSION.get')
+    def test_fetch_metars_network_error(self, mock_get):
+        """Test that network errors yield an empty result."""
+        from requests.exceptions import RequestException
+        mock_get.side_effect = RequestException("Network error")
+
+        result = fetch_metars(['KHIO', 'KPDX'])
+
+        assert result == {}
+
+
 class TestFlaskRoutes:
     """Test suite for Flask web application routes."""
     
@@ -203,9 +257,19 @@ class TestFlaskRoutes:
     def test_index_route(self):
         """Test the home page route."""
         response = self.client.get('/')
-        
+
         assert response.status_code == 200
         assert b'html' in response.data.lower()
+
+    def test_index_route_gzip(self):
+        """Test that responses are gzipped for clients that accept it."""
+        import gzip
+
+        response = self.client.get('/', headers={'Accept-Encoding': 'gzip'})
+
+        assert response.status_code == 200
+        assert response.headers.get('Content-Encoding') == 'gzip'
+        assert b'html' in gzip.decompress(response.data).lower()
     
     @patch('app.fetch_metar')
     def test_metar_route_success(self, mock_fetch):
@@ -236,6 +300,18 @@ class TestFlaskRoutes:
         assert response.status_code == 200
         assert b'Airport code must be 4 characters' in response.data
     
+    def test_metar_route_invalid_characters(self):
+        """Test METAR request with a non-ICAO airport code."""
+        response = self.client.post('/metar', data={'airport_code': '1234'})
+
+        assert response.status_code == 200
+        assert b'valid ICAO identifier' in response.data
+
+        response = self.client.post('/metar', data={'airport_code': '!!!!'})
+
+        assert response.status_code == 200
+        assert b'valid ICAO identifier' in response.data
+
     @patch('app.fetch_metar')
     def test_metar_route_fetch_failure(self, mock_fetch):
         """Test METAR request when data fetching fails."""
@@ -250,49 +326,97 @@ class TestFlaskRoutes:
     def test_metar_route_lowercase_conversion(self, mock_fetch):
         """Test that lowercase airport codes are converted to uppercase."""
         mock_fetch.return_value = "KHIO 061853Z 27008KT 10SM CLR 22/16 A3012"
-        
+
         response = self.client.post('/metar', data={'airport_code': 'khio'})
-        
+
         assert response.status_code == 200
         mock_fetch.assert_called_once_with('KHIO')
 
+    @patch('app.fetch_metars')
+    def test_metar_batch_route_success(self, mock_fetch):
+        """Test batch METAR request processing."""
+        mock_fetch.return_value = {
+            'KHIO': "KHIO 061853Z 27008KT 10SM CLR 22/16 A3012",
+            'KPDX': "KPDX 061853Z 27010KT 10SM CLR 21/15 A3010"
+        }
+
+        response = self.client.post('/metar/batch', data={'airport_codes': 'khio, KPDX'})
+
+        assert response.status_code == 200
+        assert b'KHIO' in response.data
+        assert b'KPDX' in response.data
+        mock_fetch.assert_called_once_with(['KHIO', 'KPDX'])
+
+    def test_metar_batch_route_invalid_code(self):
+        """Test batch METAR request with an invalid airport code."""
+        response = self.client.post('/metar/batch', data={'airport_codes': 'KHIO, AB'})
+
+        assert response.status_code == 200
+        assert b'Invalid airport code: AB' in response.data
+
+    def test_metar_batch_route_empty(self):
+        """Test batch METAR request with no airport codes."""
+        response = self.client.post('/metar/batch', data={'airport_codes': '  '})
+
+        assert response.status_code == 200
+        assert b'Please enter at least one airport code' in response.data
+
+    @patch('app.fetch_metars')
+    def test_api_metar_route(self, mock_fetch):
+        """Test the JSON API endpoint."""
+        mock_fetch.return_value = {'KHIO': "KHIO 061853Z 27008KT 10SM CLR 22/16 A3012"}
+
+        response = self.client.get('/api/metar?ids=KHIO,ZZZZ')
+
+        assert response.status_code == 200
+        data = response.get_json()
+        assert data['KHIO']['details']['station'] == 'KHIO'
+        assert data['ZZZZ'] is None
+
+    def test_api_metar_route_invalid(self):
+        """Test the JSON API endpoint with bad input."""
+        response = self.client.get('/api/metar')
+        assert response.status_code == 400
+
+        response = self.client.get('/api/metar?ids=NOPE!')
+        assert response.status_code == 400
+        assert 'Invalid airport code' in response.get_json()['error']
+
 
 class TestEdgeCases:
     """Test suite for edge cases and error conditions."""
     
-    def setup_method(self):
-        """Set up test fixtures before each test method."""
-        self.decoder = METARDecoder()
-    
-    def test_malformed_metar_parts(self):
+    def test_malformed_metar_parts(self, decoder):
         """Test handling of malformed METAR components."""
         # Missing components should not crash the decoder
         metar = "KHIO 061853Z INVALIDWIND INVALIDVIS"
-        result = self.decoder.decode_metar(metar)
+        result = decoder.decode_metar(metar)
         
         assert isinstance(result, dict)
         assert result['details']['station'] == 'KHIO'
     
-    def test_extreme_wind_directions(self):
+    def test_extreme_wind_directions(self, decoder):
         """Test edge cases for wind direction conversion."""
         # Test boundary conditions
-        assert self.decoder.get_wind_direction_text(361) == 'north'  # Should wrap around
-        assert self.decoder.get_wind_direction_text(-1) == 'north'  # Negative wrapping
+        assert decoder.get_wind_direction_text(361) == 'north'  # Should wrap around
+        assert decoder.get_wind_direction_text(-1) == 'north'  # Negative wrapping
+        assert decoder.get_wind_direction_text(-90) == 'west'  # -90 is 270
+        assert decoder.get_wind_direction_text(720) == 'north'  # Two full turns
     
-    def test_unusual_visibility_values(self):
+    def test_unusual_visibility_values(self, decoder):
         """Test unusual visibility formats."""
-        assert self.decoder.decode_visibility('0SM') == '0 miles visibility'
-        assert self.decoder.decode_visibility('25SM') == '10+ miles visibility'
+        assert decoder.decode_visibility('0SM') == '0 miles visibility'
+        assert decoder.decode_visibility('25SM') == '10+ miles visibility'
     
-    def test_cloud_without_altitude(self):
+    def test_cloud_without_altitude(self, decoder):
         """Test cloud conditions without altitude information."""
-        assert self.decoder.decode_clouds('FEW') == 'few clouds'
-        assert self.decoder.decode_clouds('SCT') == 'scattered clouds'
+        assert decoder.decode_clouds('FEW') == 'few clouds'
+        assert decoder.decode_clouds('SCT') == 'scattered clouds'
     
-    def test_temperature_conversion_edge_cases(self):
+    def test_temperature_conversion_edge_cases(self, decoder):
         """Test temperature conversion with extreme values."""
-        assert self.decoder.celsius_to_fahrenheit(-273) == -459  # Absolute zero
-        assert self.decoder.celsius_to_fahrenheit(1000) == 1832  # Very high temperature
+        assert decoder.celsius_to_fahrenheit(-273) == -459  # Absolute zero
+        assert decoder.celsius_to_fahrenheit(1000) == 1832  # Very high temperature
 
 
 if __name__ == '__main__':
@@ -0,0 +1,11 @@
+"""
+WSGI entry point for running the METAR Reader under a production server.
+
+The Werkzeug development server started by `python app.py` is
+single-threaded, so concurrent /metar requests serialize on the blocking
+METAR fetch. Run with a threaded WSGI server instead, e.g.:
+
+    gunicorn -w 4 -k gthread --threads 8 -b 0.0.0.0:5000 wsgi:application
+"""
+
+from app import app as application